@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pembacaan CSV secara streaming dengan posisi byte, dan checkpoint untuk
+# melanjutkan proses yang terhenti (dipakai oleh prodimap.py dan map_members.py).
+
+import csv
+import os
+from typing import Dict, Iterator, List, Optional
+
+# Iterator baris file biner yang mencatat posisi byte setelah baris terakhir yang dibaca
+class _OffsetLines:
+    """
+    Baris dipisah pada b"\n" (juga menangani CRLF). File yang hanya memakai CR
+    sebagai akhir baris (format Mac lama) dipisah pada b"\r". Dekode UTF-8
+    bersifat ketat: byte yang tidak valid menghentikan proses dengan pesan
+    yang menyebut posisi byte-nya.
+    """
+
+    def __init__(self, fb, path: str, newline: bytes = b"\n"):
+        self.fb = fb
+        self.path = path
+        self.newline = newline
+        self.offset = fb.tell()
+        self._buf = b""
+        self._pos = 0
+
+    def seek(self, offset: int) -> None:
+        self.fb.seek(offset)
+        self.offset = offset
+        self._buf = b""
+        self._pos = 0
+
+    def _readline(self) -> bytes:
+        if self.newline == b"\n":
+            return self.fb.readline()
+        while True:
+            i = self._buf.find(self.newline, self._pos)
+            if i >= 0:
+                line = self._buf[self._pos:i + 1]
+                self._pos = i + 1
+                return line
+            chunk = self.fb.read(65536)
+            if not chunk:
+                line = self._buf[self._pos:]
+                self._buf = b""
+                self._pos = 0
+                return line
+            self._buf = self._buf[self._pos:] + chunk
+            self._pos = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self._readline()
+        if not line:
+            raise StopIteration
+        encoding = "utf-8-sig" if self.offset == 0 else "utf-8"
+        try:
+            text = line.decode(encoding)
+        except UnicodeDecodeError as exc:
+            raise SystemExit(f"{self.path}: invalid UTF-8 at byte offset {self.offset + exc.start}; "
+                             f"re-export the file as UTF-8.")
+        self.offset += len(line)
+        return text
+
+# Pembaca CSV streaming yang bisa dimulai dari posisi byte tertentu
+class CsvStream:
+    """
+    Membaca header dari awal file, lalu (jika resume_offset diberikan) melompat
+    ke posisi tersebut. Setelah setiap baris dihasilkan, `offset` menunjuk ke
+    byte pertama baris berikutnya, sehingga aman disimpan sebagai checkpoint.
+    """
+
+    def __init__(self, path: str, dialect, resume_offset: int = 0):
+        self._fb = open(path, "rb")
+        # Akhir baris CR saja dideteksi dari awal file, seperti newline="" pada mode teks
+        sample = self._fb.read(65536)
+        self._fb.seek(0)
+        newline = b"\r" if b"\r" in sample and b"\n" not in sample else b"\n"
+        self._lines = _OffsetLines(self._fb, path, newline)
+        self._reader = csv.reader(self._lines, dialect)
+        self.header: List[str] = next(self._reader, [])
+        if resume_offset > self._lines.offset:
+            self._lines.seek(resume_offset)
+
+    @property
+    def offset(self) -> int:
+        return self._lines.offset
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return iter(self._reader)
+
+    def close(self) -> None:
+        self._fb.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Checkpoint berkala: posisi input, posisi output, dan statistik yang terkumpul
+class Checkpoint:
+    """
+    Disimpan sebagai JSON kecil dan ditulis secara atomik (file sementara +
+    os.replace). Output di-flush sebelum posisinya dicatat, sehingga saat
+    resume output cukup dipotong ke posisi tersebut agar tidak ada duplikat.
+    """
+
+    def __init__(self, path: str, input_path: str, options: Dict):
+        self.path = path
+        st = os.stat(input_path)
+        self.input = {"path": os.path.abspath(input_path), "size": st.st_size, "mtime": st.st_mtime}
+        self.options = options
+
+    def load(self) -> Optional[Dict]:
+        """Muat checkpoint; gagal jika input atau opsi berbeda dari run sebelumnya."""
+        import json
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get("input") != self.input:
+            raise SystemExit(f"Checkpoint {self.path} was made for a different or modified input; remove it to start over.")
+        if state.get("options") != self.options:
+            raise SystemExit(f"Checkpoint {self.path} was made with different options {state.get('options')}.")
+        return state
+
+    def save(self, input_offset: int, output_file, stats: Dict) -> None:
+        import json
+
+        output_offset = 0
+        if output_file is not None:
+            output_file.flush()
+            output_offset = output_file.tell()
+        state = {
+            "input": self.input,
+            "options": self.options,
+            "input_offset": input_offset,
+            "output_offset": output_offset,
+            "stats": stats,
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+# Fungsi untuk membuka file output, memotongnya ke posisi checkpoint saat resume
+def open_output(path: str, header: List[str], resume_state: Optional[Dict]):
+    if resume_state is None:
+        f = open(path, "w", newline="", encoding="utf-8")
+        csv.writer(f).writerow(header)
+        return f
+    output_offset = resume_state["output_offset"]
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        raise SystemExit(f"Output {path} is missing; it must match the checkpoint to resume. Remove the checkpoint to start over.")
+    if size < output_offset:
+        raise SystemExit(f"Output {path} is shorter ({size} bytes) than recorded in the checkpoint "
+                         f"({output_offset} bytes); remove the checkpoint to start over.")
+    with open(path, "r+b") as fb:
+        fb.truncate(output_offset)
+    return open(path, "a", newline="", encoding="utf-8")
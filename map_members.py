@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import contextlib
 import csv
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from checkpoint import Checkpoint, CsvStream, open_output
+from sampling import Sampler, parse_sample, warn_small_sample, wilson_interval
 
 # Mapping prodi berdasarkan inst_name
 PRODI_MAPPING = {
@@ -247,8 +251,12 @@ def find_prodi_id(inst_name: str) -> Optional[int]:
 # Fungsi untuk membaca file CSV member
 def read_member_csv(path: str) -> List[Dict]:
     """Baca file CSV member dengan deteksi format otomatis"""
-    rows = []
-    
+    with open_member_stream(path) as stream:
+        return list(iter_members(stream))
+
+# Fungsi untuk membuka file member sebagai stream (opsional mulai dari posisi byte checkpoint)
+def open_member_stream(path: str, resume_offset: int = 0) -> CsvStream:
+    """Deteksi delimiter dari awal file, lalu baca baris satu per satu"""
     with open(path, "rb") as fb:
         sample = fb.read(4096)
         try:
@@ -263,85 +271,156 @@ def read_member_csv(path: str) -> List[Dict]:
         except Exception:
             dialect = csv.excel()  # Default ke CSV excel
     
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f, dialect=dialect)
-        for row in reader:
-            rows.append(dict(row))
-    
-    return rows
+    return CsvStream(path, dialect, resume_offset)
+
+# Fungsi untuk menghasilkan baris member sebagai dict (seperti csv.DictReader)
+def iter_members(stream: CsvStream) -> Iterator[Dict]:
+    for row in stream:
+        if row:
+            yield dict(zip(stream.header, row))
 
 # Fungsi utama
 def main():
     parser = argparse.ArgumentParser(description="Map members to prodi based on inst_name")
-    parser.add_argument("--input", required=True, help="Path to member.csv file")
+    parser.add_argument("--input", help="Path to member.csv file")
     parser.add_argument("--output", default="member_prodi_mapping.csv", help="Output CSV file path")
     parser.add_argument("--verbose", action="store_true", help="Show detailed processing information")
+    parser.add_argument("--checkpoint", help="Checkpoint file path (default: <output>.ckpt)")
+    parser.add_argument("--checkpoint-every", type=int, default=100000,
+                        help="Write a checkpoint every N input rows (0 disables checkpointing)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the last checkpoint instead of row zero")
+    parser.add_argument("--stats-only", action="store_true", help="Print statistics only, without writing the output CSV")
+    parser.add_argument("--sample", type=parse_sample, metavar="N|FRACTION",
+                        help="Estimate statistics from a sample: a fraction < 1 uses stride sampling, "
+                             "a row count >= 1 uses reservoir sampling (implies --stats-only)")
+    parser.add_argument("--seed", type=int, help="Random seed for reservoir sampling")
+    parser.add_argument("--startup-report", action="store_true", help="Measure cold-start import time by module and exit")
     args = parser.parse_args()
 
-    # Baca data member
-    print("Reading member data...")
-    members = read_member_csv(args.input)
-    print(f"Loaded {len(members)} members")
+    if args.startup_report:
+        from prodimap import startup_report
+        startup_report("map_members")
+        return
+    if not args.input:
+        parser.error("the following arguments are required: --input")
+    if args.sample is not None and args.resume:
+        parser.error("--resume cannot be combined with --sample")
+
+    # --sample selalu berarti mode statistik saja; checkpoint tidak dipakai
+    sampler = Sampler(args.sample, args.seed) if args.sample is not None else None
+    stats_only = args.stats_only or sampler is not None
 
-    # Proses mapping
-    mapping_results = []
-    stats = {
+    checkpoint = None
+    state = None
+    if sampler is None and (args.checkpoint_every > 0 or args.resume):
+        checkpoint = Checkpoint(args.checkpoint or args.output + ".ckpt", args.input, {"stats_only": stats_only})
+        if args.resume:
+            state = checkpoint.load()
+            if state is None:
+                print(f"No checkpoint found at {checkpoint.path}; starting from the beginning.")
+
+    # Proses mapping secara streaming
+    stats = state["stats"] if state else {
+        "total": 0,
         "mapped": 0,
         "unmapped": 0,
-        "prodi_counts": {}
+        "prodi_counts": {},
+        "unmapped_samples": [],
     }
+    # Kunci JSON selalu string; kembalikan ke int untuk prodi_id
+    stats["prodi_counts"] = {int(k): v for k, v in stats["prodi_counts"].items()}
+    unmapped_samples = stats["unmapped_samples"]
 
-    for member in members:
-        member_id = member.get('member_id', '')
-        inst_name = member.get('inst_name', '')
-        
-        prodi_id = find_prodi_id(inst_name)
-        
-        if prodi_id:
-            mapping_results.append((member_id, prodi_id))
-            stats["mapped"] += 1
-            stats["prodi_counts"][prodi_id] = stats["prodi_counts"].get(prodi_id, 0) + 1
+    print("Reading member data...")
+    if state:
+        print(f"Resuming after {stats['total']} members from {checkpoint.path}")
+
+    with open_member_stream(args.input, state["input_offset"] if state else 0) as stream, \
+            (contextlib.nullcontext() if stats_only else open_output(args.output, ["member_id", "prodi_id"], state)) as f:
+        writer = csv.writer(f) if f is not None else None
+        members = iter_members(stream)
+        if sampler is not None:
+            members = sampler.sample(members)
+
+        for member in members:
+            member_id = member.get('member_id', '')
+            inst_name = member.get('inst_name', '')
+            stats["total"] += 1
+            
+            prodi_id = find_prodi_id(inst_name)
             
-            if args.verbose:
-                print(f"✓ {member_id}: {inst_name} -> Prodi {prodi_id}")
-        else:
-            stats["unmapped"] += 1
-            if args.verbose:
-                print(f"✗ {member_id}: {inst_name} -> Tidak terpetakan")
+            if prodi_id:
+                if writer is not None:
+                    writer.writerow([member_id, prodi_id])
+                stats["mapped"] += 1
+                stats["prodi_counts"][prodi_id] = stats["prodi_counts"].get(prodi_id, 0) + 1
+                
+                if args.verbose:
+                    print(f"✓ {member_id}: {inst_name} -> Prodi {prodi_id}")
+            else:
+                stats["unmapped"] += 1
+                # Simpan contoh inst_name yang tidak terpetakan (dibatasi 10)
+                if inst_name and len(unmapped_samples) < 10 and inst_name not in unmapped_samples:
+                    unmapped_samples.append(inst_name)
+                if args.verbose:
+                    print(f"✗ {member_id}: {inst_name} -> Tidak terpetakan")
+
+            if checkpoint is not None and args.checkpoint_every > 0 and stats["total"] % args.checkpoint_every == 0:
+                checkpoint.save(stream.offset, f, stats)
 
-    # Tulis hasil ke CSV
-    with open(args.output, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["member_id", "prodi_id"])
-        for member_id, prodi_id in mapping_results:
-            writer.writerow([member_id, prodi_id])
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    if sampler is not None:
+        print_sampled_stats(sampler, stats)
+        return
+
+    total = stats["total"]
+    print(f"Loaded {total} members")
 
     # Tampilkan statistik
     print(f"\n=== MAPPING STATISTICS ===")
-    print(f"Total members: {len(members)}")
-    print(f"Successfully mapped: {stats['mapped']} ({stats['mapped']/len(members)*100:.1f}%)")
-    print(f"Unmapped: {stats['unmapped']} ({stats['unmapped']/len(members)*100:.1f}%)")
+    print(f"Total members: {total}")
+    print(f"Successfully mapped: {stats['mapped']} ({stats['mapped']/total*100:.1f}%)")
+    print(f"Unmapped: {stats['unmapped']} ({stats['unmapped']/total*100:.1f}%)")
     
     print(f"\nDistribution by Prodi:")
     for prodi_id in sorted(stats["prodi_counts"].keys()):
         count = stats["prodi_counts"][prodi_id]
         print(f"  Prodi {prodi_id}: {count} members ({count/stats['mapped']*100:.1f}%)")
     
-    print(f"\nOutput written to: {args.output}")
+    if not stats_only:
+        print(f"\nOutput written to: {args.output}")
 
     # Tampilkan contoh yang tidak terpetakan (jika ada)
     if stats["unmapped"] > 0 and args.verbose:
         print(f"\nSample of unmapped inst_name values:")
-        unmapped_samples = set()
-        for member in members:
-            inst_name = member.get('inst_name', '')
-            if inst_name and not find_prodi_id(inst_name):
-                unmapped_samples.add(inst_name)
-                if len(unmapped_samples) >= 10:  # Batasi sampel yang ditampilkan
-                    break
-        
         for sample in sorted(unmapped_samples):
             print(f"  - '{sample}'")
 
+# Fungsi untuk mencetak statistik hasil sampling beserta interval kepercayaan 95%
+def print_sampled_stats(sampler: Sampler, stats: Dict) -> None:
+    """Estimasi cakupan mapping dan distribusi prodi dari sampel"""
+    total = sampler.seen
+    sampled = stats["total"]
+    mapped = stats["mapped"]
+    warn_small_sample(sampled, total)
+    print(f"Loaded {total} members")
+
+    print(f"\n=== MAPPING STATISTICS (estimated, {sampler.method} sample of {sampled}/{total}) ===")
+    print(f"Total members: {total}")
+    if not sampled:
+        return
+    for label, count in (("Successfully mapped", mapped), ("Unmapped", stats["unmapped"])):
+        lo, hi = wilson_interval(count, sampled)
+        print(f"{label}: ~{count / sampled * total:.0f} ({count / sampled * 100:.1f}%, CI {lo * 100:.1f}-{hi * 100:.1f}%)")
+
+    print(f"\nDistribution by Prodi (95% CI):")
+    for prodi_id in sorted(stats["prodi_counts"].keys()):
+        count = stats["prodi_counts"][prodi_id]
+        lo, hi = wilson_interval(count, mapped)
+        print(f"  Prodi {prodi_id}: ~{count / sampled * total:.0f} members "
+              f"({count / mapped * 100:.1f}%, CI {lo * 100:.1f}-{hi * 100:.1f}%)")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,19 +2,17 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import contextlib
 import csv
-import json
+import functools
 import math
 import os
 import re
 import sys
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Set
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from checkpoint import Checkpoint, CsvStream, open_output
+from sampling import Sampler, parse_sample, warn_small_sample, wilson_interval
 
 # Data Prodi
 PRODI_MAP = {
@@ -183,11 +181,6 @@ DOMAIN = {
 def normalize(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "")).strip().lower()
 
-# Fungsi untuk memeriksa apakah ada kata kunci dalam teks
-def has_any(text: str, keywords) -> bool:
-    t = normalize(text)
-    return any(k in t for k in keywords)
-
 # Fungsi untuk mendeteksi format CSV
 def sniff_dialect(sample: bytes):
     """
@@ -211,31 +204,31 @@ def sniff_dialect(sample: bytes):
 
 # Fungsi untuk membaca file CSV fleksibel
 def read_csv_flexible(path: str) -> List[Dict]:
+    with open_biblio_stream(path) as stream:
+        return list(iter_biblio_rows(stream))
+
+# Fungsi untuk membuka file biblio sebagai stream (opsional mulai dari posisi byte checkpoint)
+def open_biblio_stream(path: str, resume_offset: int = 0) -> CsvStream:
     with open(path, "rb") as fb:
         sample = fb.read(4096)  # Membaca sebagian file untuk deteksi format
         dialect = sniff_dialect(sample)  # Memanggil fungsi sniff_dialect
-    
-    rows = []
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.reader(f, dialect)  # Menggunakan dialect yang terdeteksi
-        try:
-            fieldnames = next(reader)  # Ambil header dari CSV
-        except StopIteration:
-            return rows
-        fieldnames_norm = [normalize(h) for h in fieldnames]  # Normalisasi header
-        idx_id = alias_index(fieldnames_norm, "biblio_id")
-        idx_title = alias_index(fieldnames_norm, "title")
-        idx_topic = alias_index(fieldnames_norm, "topic")  # Kolom topic
-
-        for r in reader:
-            if not r:
-                continue
-            bid = r[idx_id].strip() if idx_id is not None else ""
-            tit = r[idx_title].strip() if idx_title is not None else ""
-            top = r[idx_topic].strip() if idx_topic is not None else ""  # Ambil topic
-            if bid and tit:
-                rows.append({"biblio_id": bid, "title": tit, "topic": top})  # Menyertakan topic
-    return rows
+    return CsvStream(path, dialect, resume_offset)
+
+# Fungsi untuk menghasilkan baris biblio_id + title + topic satu per satu
+def iter_biblio_rows(stream: CsvStream) -> Iterator[Dict]:
+    fieldnames_norm = [normalize(h) for h in stream.header]  # Normalisasi header
+    idx_id = alias_index(fieldnames_norm, "biblio_id")
+    idx_title = alias_index(fieldnames_norm, "title")
+    idx_topic = alias_index(fieldnames_norm, "topic")  # Kolom topic
+
+    for r in stream:
+        if not r:
+            continue
+        bid = r[idx_id].strip() if idx_id is not None else ""
+        tit = r[idx_title].strip() if idx_title is not None else ""
+        top = r[idx_topic].strip() if idx_topic is not None else ""  # Ambil topic
+        if bid and tit:
+            yield {"biblio_id": bid, "title": tit, "topic": top}  # Menyertakan topic
 
 # Fungsi untuk mencari indeks berdasarkan alias
 def alias_index(fieldnames_norm: List[str], target: str) -> Optional[int]:
@@ -256,139 +249,399 @@ def alias_index(fieldnames_norm: List[str], target: str) -> Optional[int]:
             return i
     return None
 
+# Prodi yang dipilih untuk setiap domain
+DOMAIN_PRODI = {
+    "gizi": {21},  # Prodi Gizi
+    "akuntansi": {4, 5, 6},  # Prodi Akuntansi
+    "teknologi_informasi": {26},  # Prodi Teknologi Informasi
+    "pendidikan_bahasa_inggris": {7, 12},  # Pendidikan Bahasa Inggris
+    "teknik_mesin": {28},  # Teknik Mesin
+    "pariwisata": {1},  # Pariwisata
+    "manajemen": {2},  # Manajemen
+    "hukum": {18},  # Hukum
+    "farmasi": {25},  # Farmasi
+    "pertanian": {23, 24},  # Agroteknologi dan Agribisnis
+    "ekonomi_pembangunan": {3},  # Ekonomi Pembangunan
+    "pendidikan_matematika": {9},  # Pendidikan Matematika
+    "pendidikan_ipa": {10},  # Pendidikan IPA
+    "pendidikan_biologi": {11},  # Pendidikan Biologi
+    "ilmu_komunikasi": {16},  # Ilmu Komunikasi
+    "administrasi_publik": {15, 17},  # Administrasi Publik dan Ilmu Administrasi Negara
+    "teknik_sipil": {27},  # Teknik Sipil
+    "teknik_elektro": {31},  # Teknik Elektro
+    "teknik_industri": {30},  # Teknik Industri
+    "peternakan": {20},  # Peternakan
+    "akuakultur": {22},  # Akuakultur
+    "teknologi_pangan": {19},  # Teknologi Pangan
+}
+
+# Fallback ke prodi yang lebih umum berdasarkan kata kunci umum (dicek berurutan)
+FALLBACK_RULES = [
+    (["pendidikan", "pengajaran", "belajar", "mengajar"], {9, 10, 11, 12, 13}),  # Prodi pendidikan
+    (["teknik", "engineering", "teknologi"], {26, 27, 28, 29, 30, 31, 32}),  # Prodi teknik
+    (["ekonomi", "bisnis", "manajemen", "pemasaran"], {2, 3, 4}),  # Prodi ekonomi dan bisnis
+]
+DEFAULT_PRODI = {26}  # Default fallback ke Teknologi Informasi
+
+# Tabel aturan dibangun sekali saat pertama kali dipakai, bukan saat modul diimpor
+@functools.lru_cache(maxsize=None)
+def rule_table() -> Tuple[Tuple[Tuple[str, ...], frozenset], ...]:
+    """
+    Menggabungkan DOMAIN dan DOMAIN_PRODI menjadi daftar (kata kunci, prodi)
+    yang siap dicocokkan terhadap teks yang sudah dinormalisasi.
+    """
+    return tuple(
+        (tuple(normalize(k) for k in DOMAIN[name]), frozenset(prodi))
+        for name, prodi in DOMAIN_PRODI.items()
+    )
+
 # Fungsi untuk melakukan pemetaan prodi berdasarkan title dan topic
 def rule_based_prodi_multi(title: str, topic: str) -> Set[int]:
-    t = re.sub(r"\s+", " ", (title or "")).strip().lower()
-    topic_normalized = re.sub(r"\s+", " ", (topic or "")).strip().lower()
+    t = normalize(title)
+    topic_normalized = normalize(topic)
     chosen: Set[int] = set()
 
     # Mencocokkan berdasarkan domain dan cue dari title dan topic
-    if has_any(t, DOMAIN["gizi"]) or has_any(topic, DOMAIN["gizi"]):
-        chosen |= {21}  # Prodi Gizi
-    
-    if has_any(t, DOMAIN["akuntansi"]) or has_any(topic, DOMAIN["akuntansi"]):
-        chosen |= {4, 5, 6}  # Prodi Akuntansi
-    
-    if has_any(t, DOMAIN["teknologi_informasi"]) or has_any(topic, DOMAIN["teknologi_informasi"]):
-        chosen |= {26}  # Prodi Teknologi Informasi
-    
-    if has_any(t, DOMAIN["pendidikan_bahasa_inggris"]) or has_any(topic, DOMAIN["pendidikan_bahasa_inggris"]):
-        chosen |= {7, 12}  # Pendidikan Bahasa Inggris
-    
-    if has_any(t, DOMAIN["teknik_mesin"]) or has_any(topic, DOMAIN["teknik_mesin"]):
-        chosen |= {28}  # Teknik Mesin
-    
-    if has_any(t, DOMAIN["pariwisata"]) or has_any(topic, DOMAIN["pariwisata"]):
-        chosen |= {1}  # Pariwisata
-    
-    if has_any(t, DOMAIN["manajemen"]) or has_any(topic, DOMAIN["manajemen"]):
-        chosen |= {2}  # Manajemen
-    
-    if has_any(t, DOMAIN["hukum"]) or has_any(topic, DOMAIN["hukum"]):
-        chosen |= {18}  # Hukum
-    
-    if has_any(t, DOMAIN["farmasi"]) or has_any(topic, DOMAIN["farmasi"]):
-        chosen |= {25}  # Farmasi
-    
-    if has_any(t, DOMAIN["pertanian"]) or has_any(topic, DOMAIN["pertanian"]):
-        chosen |= {23, 24}  # Agroteknologi dan Agribisnis
-    
-    if has_any(t, DOMAIN["ekonomi_pembangunan"]) or has_any(topic, DOMAIN["ekonomi_pembangunan"]):
-        chosen |= {3}  # Ekonomi Pembangunan
-    
-    if has_any(t, DOMAIN["pendidikan_matematika"]) or has_any(topic, DOMAIN["pendidikan_matematika"]):
-        chosen |= {9}  # Pendidikan Matematika
-    
-    if has_any(t, DOMAIN["pendidikan_ipa"]) or has_any(topic, DOMAIN["pendidikan_ipa"]):
-        chosen |= {10}  # Pendidikan IPA
-    
-    if has_any(t, DOMAIN["pendidikan_biologi"]) or has_any(topic, DOMAIN["pendidikan_biologi"]):
-        chosen |= {11}  # Pendidikan Biologi
-    
-    if has_any(t, DOMAIN["ilmu_komunikasi"]) or has_any(topic, DOMAIN["ilmu_komunikasi"]):
-        chosen |= {16}  # Ilmu Komunikasi
-    
-    if has_any(t, DOMAIN["administrasi_publik"]) or has_any(topic, DOMAIN["administrasi_publik"]):
-        chosen |= {15, 17}  # Administrasi Publik dan Ilmu Administrasi Negara
-    
-    if has_any(t, DOMAIN["teknik_sipil"]) or has_any(topic, DOMAIN["teknik_sipil"]):
-        chosen |= {27}  # Teknik Sipil
-    
-    if has_any(t, DOMAIN["teknik_elektro"]) or has_any(topic, DOMAIN["teknik_elektro"]):
-        chosen |= {31}  # Teknik Elektro
-    
-    if has_any(t, DOMAIN["teknik_industri"]) or has_any(topic, DOMAIN["teknik_industri"]):
-        chosen |= {30}  # Teknik Industri
-    
-    if has_any(t, DOMAIN["peternakan"]) or has_any(topic, DOMAIN["peternakan"]):
-        chosen |= {20}  # Peternakan
-    
-    if has_any(t, DOMAIN["akuakultur"]) or has_any(topic, DOMAIN["akuakultur"]):
-        chosen |= {22}  # Akuakultur
-    
-    if has_any(t, DOMAIN["teknologi_pangan"]) or has_any(topic, DOMAIN["teknologi_pangan"]):
-        chosen |= {19}  # Teknologi Pangan
+    for keywords, prodi in rule_table():
+        if any(k in t for k in keywords) or any(k in topic_normalized for k in keywords):
+            chosen |= prodi
 
     # Jika tidak ada pencocokan sama sekali, berikan beberapa prodi umum sebagai fallback
     if not chosen:
-        # Fallback ke prodi yang lebih umum berdasarkan kata kunci umum
-        if any(word in t for word in ["pendidikan", "pengajaran", "belajar", "mengajar"]):
-            chosen |= {9, 10, 11, 12, 13}  # Prodi pendidikan
-        elif any(word in t for word in ["teknik", "engineering", "teknologi"]):
-            chosen |= {26, 27, 28, 29, 30, 31, 32}  # Prodi teknik
-        elif any(word in t for word in ["ekonomi", "bisnis", "manajemen", "pemasaran"]):
-            chosen |= {2, 3, 4}  # Prodi ekonomi dan bisnis
+        for words, prodi in FALLBACK_RULES:
+            if any(word in t for word in words):
+                chosen |= prodi
+                break
         else:
-            chosen |= {26}  # Default fallback ke Teknologi Informasi
+            chosen |= DEFAULT_PRODI
 
     return chosen
 
+# Bobot untuk mode scoring
+TITLE_WEIGHT = 1.0  # Kecocokan di title
+TOPIC_WEIGHT = 0.5  # Kecocokan di topic
+FALLBACK_WEIGHT = 0.25  # Kata kunci umum pada fallback
+PHRASE_BONUS = 0.5  # Tambahan bobot per kata tambahan dalam frasa
+
+# Fungsi untuk mendaftar semua kata kunci yang dipakai dalam scoring
+def scoring_terms() -> List[str]:
+    terms = {k for keywords, _ in rule_table() for k in keywords}
+    terms.update(word for words, _ in FALLBACK_RULES for word in words)
+    return sorted(terms)
+
+# Fungsi untuk menghitung IDF setiap kata kunci atas seluruh katalog (satu kali lintasan)
+def build_weight_table(rows: Iterable[Dict]) -> Dict[str, float]:
+    """
+    Menghitung IDF (ter-smoothing) untuk setiap kata kunci berdasarkan berapa
+    banyak judul/topic di katalog yang memuatnya. Kata kunci generik seperti
+    "manajemen" atau "teknologi" mendapat bobot lebih rendah.
+    """
+    terms = scoring_terms()
+    df = dict.fromkeys(terms, 0)
+    n = 0
+    for r in rows:
+        n += 1
+        doc = normalize(r["title"]) + " | " + normalize(r["topic"])
+        for k in terms:
+            if k in doc:
+                df[k] += 1
+    return {k: math.log((1 + n) / (1 + df[k])) + 1.0 for k in terms}
+
+# Fungsi untuk memuat tabel bobot dari cache, atau membangunnya jika cache tidak valid
+def load_weight_table(input_path: str, cache_path: Optional[str] = None,
+                      rows: Optional[Iterable[Dict]] = None, write_cache: bool = True) -> Dict[str, float]:
+    """
+    Cache disimpan sebagai JSON dan hanya dipakai jika path/ukuran/mtime file input
+    dan daftar kata kunci masih sama dengan saat cache dibuat. Jika `rows`
+    diberikan (misalnya sampel), IDF dihitung dari baris tersebut alih-alih
+    membaca seluruh input; hasil seperti itu tidak ditulis ke cache.
+    """
+    import json
+
+    cache_path = cache_path or os.path.basename(input_path) + ".weights.json"
+    st = os.stat(input_path)
+    fingerprint = {"path": os.path.abspath(input_path), "size": st.st_size, "mtime": st.st_mtime}
+    terms = scoring_terms()
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("input") == fingerprint and sorted(cached.get("weights", {})) == terms:
+            return cached["weights"]
+    except (OSError, ValueError):
+        pass
+
+    if rows is not None:
+        return build_weight_table(rows)
+    with open_biblio_stream(input_path) as stream:
+        weights = build_weight_table(iter_biblio_rows(stream))
+    if not write_cache:
+        return weights
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"input": fingerprint, "weights": weights}, f)
+    except OSError as exc:
+        print(f"Warning: could not write weight cache {cache_path}: {exc}", file=sys.stderr)
+    return weights
+
+# Fungsi untuk menggabungkan IDF dan panjang frasa menjadi tabel scoring per domain
+def scoring_table(weights: Dict[str, float]):
+    def phrase_weight(k: str) -> float:
+        return weights.get(k, 1.0) * (1.0 + PHRASE_BONUS * (len(k.split()) - 1))
+
+    domains = tuple(
+        (tuple((k, phrase_weight(k)) for k in keywords), prodi)
+        for keywords, prodi in rule_table()
+    )
+    fallbacks = tuple(
+        (tuple((w, phrase_weight(w)) for w in words), frozenset(prodi))
+        for words, prodi in FALLBACK_RULES
+    )
+    return domains, fallbacks
+
+# Fungsi untuk memberi skor setiap prodi berdasarkan title dan topic
+def score_prodi(title: str, topic: str, table) -> Dict[int, float]:
+    t = normalize(title)
+    topic_normalized = normalize(topic)
+    domains, fallbacks = table
+    scores: Dict[int, float] = {}
+
+    for keywords, prodi in domains:
+        s = 0.0
+        for k, w in keywords:
+            if k in t:
+                s += w * TITLE_WEIGHT
+            if k in topic_normalized:
+                s += w * TOPIC_WEIGHT
+        if s:
+            for pid in prodi:
+                scores[pid] = scores.get(pid, 0.0) + s
+
+    # Fallback hanya jika tidak ada domain yang cocok, sama seperti mode rule-based.
+    # Tanpa kata kunci sama sekali, tidak ada skor (DEFAULT_PRODI hanya tebakan
+    # mode rule-based), sehingga title tersebut tidak menghasilkan baris output.
+    if not scores:
+        for words, prodi in fallbacks:
+            s = sum(w for word, w in words if word in t) * FALLBACK_WEIGHT
+            if s:
+                scores = dict.fromkeys(prodi, s)
+                break
+
+    return scores
+
+# Frasa deskriptor per prodi, dipakai untuk membedakan prodi yang skornya seri
+@functools.lru_cache(maxsize=None)
+def descriptor_table() -> Dict[int, Tuple[Tuple[str, ...], Optional[str]]]:
+    """
+    Memecah PRODI_DESCRIPTORS menjadi frasa ternormalisasi dan jenjang
+    (S1, S2, D3, D4) yang tercantum di akhir deskripsi.
+    """
+    table = {}
+    for pid, desc in PRODI_DESCRIPTORS.items():
+        phrases = [normalize(p) for p in desc.split(",") if normalize(p)]
+        jenjang = phrases.pop() if phrases and re.fullmatch(r"[sd]\d", phrases[-1]) else None
+        table[pid] = (tuple(phrases), jenjang)
+    return table
+
+# Fungsi untuk menghitung kecocokan teks dengan deskriptor satu prodi
+def descriptor_score(pid: int, text: str) -> int:
+    phrases, jenjang = descriptor_table().get(pid, ((), None))
+    score = sum(len(p.split()) for p in phrases if p in text)
+    if jenjang and re.search(rf"\b{jenjang}\b", text):
+        score += 1
+    return score
+
+# Fungsi untuk mengambil K prodi dengan skor tertinggi
+def top_k_prodi(scores: Dict[int, float], k: int, text: str = "") -> List[Tuple[int, float]]:
+    """
+    Mengembalikan paling banyak K prodi. Prodi dalam satu domain (misalnya
+    akuntansi {4, 5, 6}) atau satu grup fallback selalu mendapat skor yang
+    sama, jadi seri dipecah dengan kecocokan `text` (title + topic yang sudah
+    dinormalisasi) terhadap PRODI_DESCRIPTORS, berbobot jumlah kata per frasa
+    ditambah jenjang yang disebut; prodi_id kecil hanya dipakai sebagai
+    penentu terakhir.
+    """
+    return sorted(scores.items(), key=lambda kv: (-kv[1], -descriptor_score(kv[0], text), kv[0]))[:k]
+
+# Fungsi untuk mengukur waktu impor per modul saat cold start
+def startup_report(module: str = "prodimap", top: int = 15) -> None:
+    """
+    Menjalankan interpreter baru dengan -X importtime untuk interpreter kosong
+    dan untuk `import <module>`, lalu mencetak selisih waktu dan modul terberat.
+    """
+    import subprocess
+    import time
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def run(code: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=here, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        timings = {}
+        for line in proc.stderr.splitlines():
+            m = re.match(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)", line)
+            if m:
+                timings[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+        return elapsed, timings
+
+    bare_wall, bare = run("pass")
+    mod_wall, loaded = run(f"import {module}")
+    extra = {name: t for name, t in loaded.items() if name not in bare}
+
+    print(f"Startup report for '{module}':")
+    print(f"  Bare interpreter: {bare_wall * 1000:.1f} ms")
+    print(f"  With import {module}: {mod_wall * 1000:.1f} ms (+{(mod_wall - bare_wall) * 1000:.1f} ms)")
+    print(f"  Modules imported beyond bare interpreter: {len(extra)}")
+    print(f"\nSlowest imports (self / cumulative, ms):")
+    for name, (self_us, cum_us) in sorted(extra.items(), key=lambda kv: kv[1][0], reverse=True)[:top]:
+        print(f"  {name:<30} {self_us / 1000:7.2f} / {cum_us / 1000:7.2f}")
+
 # Main function
 def main():
     ap = argparse.ArgumentParser(description="Classify (multi-label) search_biblio titles into multiple prodi IDs.")
-    ap.add_argument("--input", required=True, help="Path to search_biblio.csv or search_biblio.sql")
+    ap.add_argument("--input", help="Path to search_biblio.csv or search_biblio.sql")
     ap.add_argument("--output-csv", default="classifications.csv", help="Output CSV path (biblio_id,prodi_id rows)")
     ap.add_argument("--verbose", action="store_true", help="Show detailed processing information")
+    ap.add_argument("--mode", choices=["rules", "score"], default="rules",
+                    help="rules: all matching prodi; score: top-K prodi ranked by IDF-weighted keyword hits")
+    ap.add_argument("--top-k", type=int, default=3, help="Maximum number of prodi kept per title in score mode (ties broken by prodi descriptors, then prodi_id)")
+    ap.add_argument("--weights-cache", help="Path to the cached IDF weight table (default: <input name>.weights.json next to --output-csv)")
+    ap.add_argument("--checkpoint", help="Checkpoint file path (default: <output-csv>.ckpt)")
+    ap.add_argument("--checkpoint-every", type=int, default=100000,
+                    help="Write a checkpoint every N input rows (0 disables checkpointing)")
+    ap.add_argument("--resume", action="store_true", help="Continue from the last checkpoint instead of row zero")
+    ap.add_argument("--stats-only", action="store_true", help="Print statistics only, without writing the output CSV")
+    ap.add_argument("--sample", type=parse_sample, metavar="N|FRACTION",
+                    help="Estimate statistics from a sample: a fraction < 1 uses stride sampling, "
+                         "a row count >= 1 uses reservoir sampling (implies --stats-only)")
+    ap.add_argument("--seed", type=int, help="Random seed for reservoir sampling")
+    ap.add_argument("--startup-report", action="store_true", help="Measure cold-start import time by module and exit")
     args = ap.parse_args()
 
-    rows = read_csv_flexible(args.input)
-    print(f"Loaded {len(rows)} rows with biblio_id + title + topic.")
+    if args.startup_report:
+        startup_report("prodimap")
+        return
+    if not args.input:
+        ap.error("the following arguments are required: --input")
+    if args.top_k < 1:
+        ap.error("--top-k must be at least 1")
+    if args.sample is not None and args.resume:
+        ap.error("--resume cannot be combined with --sample")
 
-    pair_rows = []
-    classification_stats = {}
-    
-    for i, r in enumerate(rows):
-        if args.verbose and i % 1000 == 0:
-            print(f"Processing row {i}/{len(rows)}...")
-        
-        pset = rule_based_prodi_multi(r["title"], r["topic"])
-        
-        # Statistics
-        num_prodi = len(pset)
-        classification_stats[num_prodi] = classification_stats.get(num_prodi, 0) + 1
-
-        for pid in pset:
-            pair_rows.append((str(r["biblio_id"]), pid))
-
-    with open(args.output_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["biblio_id", "prodi_id"])
-        for bid, pid in pair_rows:
-            w.writerow([bid, pid])
+    # --sample selalu berarti mode statistik saja; checkpoint tidak dipakai
+    sampler = Sampler(args.sample, args.seed) if args.sample is not None else None
+    stats_only = args.stats_only or sampler is not None
+
+    # Saat sampling, tabel bobot dibangun dari sampel (lihat di bawah) agar tidak membaca seluruh input
+    if args.mode == "score" and not args.weights_cache:
+        # Cache default ditulis di direktori output, bukan di direktori input (sering direktori ekspor bersama)
+        args.weights_cache = os.path.join(os.path.dirname(os.path.abspath(args.output_csv)),
+                                          os.path.basename(args.input) + ".weights.json")
+
+    table = None
+    if args.mode == "score" and sampler is None:
+        table = scoring_table(load_weight_table(args.input, args.weights_cache, write_cache=not stats_only))
+
+    checkpoint = None
+    state = None
+    if sampler is None and (args.checkpoint_every > 0 or args.resume):
+        options = {"mode": args.mode, "top_k": args.top_k if args.mode == "score" else None, "stats_only": stats_only}
+        checkpoint = Checkpoint(args.checkpoint or args.output_csv + ".ckpt", args.input, options)
+        if args.resume:
+            state = checkpoint.load()
+            if state is None:
+                print(f"No checkpoint found at {checkpoint.path}; starting from the beginning.")
+
+    stats = state["stats"] if state else {"input_rows": 0, "output_rows": 0, "per_title": {}}
+    # Kunci JSON selalu string; kembalikan ke int untuk jumlah prodi per title
+    classification_stats = {int(k): v for k, v in stats["per_title"].items()}
+    input_rows = stats["input_rows"]
+    output_rows = stats["output_rows"]
+    if state:
+        print(f"Resuming after {input_rows} rows from {checkpoint.path}")
+
+    header = ["biblio_id", "prodi_id", "score"] if args.mode == "score" else ["biblio_id", "prodi_id"]
+    with open_biblio_stream(args.input, state["input_offset"] if state else 0) as stream, \
+            (contextlib.nullcontext() if stats_only else open_output(args.output_csv, header, state)) as f:
+        w = csv.writer(f) if f is not None else None
+
+        def save_checkpoint():
+            checkpoint.save(stream.offset, f, {
+                "input_rows": input_rows,
+                "output_rows": output_rows,
+                "per_title": classification_stats,
+            })
+
+        rows = iter_biblio_rows(stream)
+        if sampler is not None:
+            rows = sampler.sample(rows)
+            if args.mode == "score":
+                rows = list(rows)
+                table = scoring_table(load_weight_table(args.input, args.weights_cache, rows=rows))
+
+        for r in rows:
+            if args.verbose and input_rows % 1000 == 0:
+                print(f"Processing row {input_rows}...")
+            
+            if table is not None:
+                text = normalize(r["title"]) + " | " + normalize(r["topic"])
+                ranked = top_k_prodi(score_prodi(r["title"], r["topic"], table), args.top_k, text)
+                out = [(r["biblio_id"], pid, round(score, 4)) for pid, score in ranked]
+            else:
+                out = [(r["biblio_id"], pid) for pid in rule_based_prodi_multi(r["title"], r["topic"])]
+            if w is not None:
+                w.writerows(out)
+            
+            # Statistics
+            num_prodi = len(out)
+            classification_stats[num_prodi] = classification_stats.get(num_prodi, 0) + 1
+            input_rows += 1
+            output_rows += num_prodi
+
+            if checkpoint is not None and args.checkpoint_every > 0 and input_rows % args.checkpoint_every == 0:
+                save_checkpoint()
+
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    if sampler is not None:
+        print_sampled_stats(sampler, input_rows, output_rows, classification_stats)
+        return
 
     # Print statistics
     print(f"\nClassification Statistics:")
-    print(f"Input rows: {len(rows)}")
-    print(f"Output rows: {len(pair_rows)}")
-    print(f"Multi-label ratio: {len(pair_rows)/len(rows):.2f}x")
+    print(f"Input rows: {input_rows}")
+    print(f"Output rows: {output_rows}")
+    print(f"Multi-label ratio: {output_rows/input_rows:.2f}x")
     
     print(f"\nDistribution of number of prodi per title:")
     for num_prodi in sorted(classification_stats.keys()):
         count = classification_stats[num_prodi]
-        percentage = (count / len(rows)) * 100
+        percentage = (count / input_rows) * 100
         print(f"  {num_prodi} prodi: {count} titles ({percentage:.1f}%)")
     
-    print(f"\nDone. Wrote: {args.output_csv}")
+    if not stats_only:
+        print(f"\nDone. Wrote: {args.output_csv}")
+
+# Fungsi untuk mencetak statistik hasil sampling beserta interval kepercayaan 95%
+def print_sampled_stats(sampler: Sampler, sampled: int, output_rows: int, classification_stats: Dict[int, int]) -> None:
+    total = sampler.seen
+    warn_small_sample(sampled, total)
+    print(f"\nClassification Statistics (estimated, {sampler.method} sample of {sampled}/{total} rows):")
+    print(f"Input rows: {total}")
+    if not sampled:
+        return
+    print(f"Estimated output rows: {output_rows / sampled * total:.0f}")
+    print(f"Multi-label ratio: {output_rows / sampled:.2f}x")
+
+    print(f"\nDistribution of number of prodi per title (95% CI):")
+    for num_prodi in sorted(classification_stats.keys()):
+        count = classification_stats[num_prodi]
+        lo, hi = wilson_interval(count, sampled)
+        print(f"  {num_prodi} prodi: ~{count / sampled * total:.0f} titles "
+              f"({count / sampled * 100:.1f}%, CI {lo * 100:.1f}-{hi * 100:.1f}%)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
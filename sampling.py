@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Sampling atas stream input dan interval kepercayaan untuk estimasi statistik
+# (dipakai oleh prodimap.py dan map_members.py pada mode --sample).
+
+import argparse
+import math
+import sys
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Fungsi untuk mem-parsing nilai --sample: pecahan (<1) atau jumlah baris (>=1)
+def parse_sample(value: str):
+    """
+    Nilai di bawah 1 (misalnya 0.05) berarti stride sampling dengan fraksi
+    tersebut; nilai bulat 1 ke atas (misalnya 5000) berarti reservoir sampling
+    dengan ukuran sampel tersebut. Nilai >= 1 yang ditulis dengan titik desimal
+    (misalnya 1.0) ditolak karena ambigu antara 100% dan satu baris.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sample value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError("sample must be a fraction in (0, 1) or a row count >= 1")
+    if number < 1:
+        return number
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"sample size {value!r} must be a whole number of rows; use a fraction below 1 "
+            f"(e.g. 0.5) for stride sampling, or omit --sample for a full pass")
+
+# Ukuran sampel minimum agar interval kepercayaan cukup bermakna
+MIN_SAMPLE_SIZE = 100
+
+# Fungsi untuk memperingatkan bila sampel terlalu kecil untuk estimasi yang berarti
+def warn_small_sample(sampled: int, total: int) -> None:
+    if sampled < min(MIN_SAMPLE_SIZE, total):
+        print(f"Warning: only {sampled} rows sampled; estimates and confidence intervals "
+              f"are not meaningful below {MIN_SAMPLE_SIZE} rows.", file=sys.stderr)
+
+# Pengambil sampel dari stream baris tanpa mengetahui jumlah total di awal
+class Sampler:
+    """
+    Stride: ambil baris ke-i (mulai 0) bila int((i + 1) * f) > int(i * f),
+    secara lazy; dari n baris terambil tepat int(n * f) baris yang tersebar
+    merata, sehingga fraksi apa pun di (0, 1) dipenuhi (tidak dibulatkan ke 1/k).
+    Reservoir: simpan `size` baris acak (Algorithm R) lalu hasilkan di akhir.
+    Setelah iterasi selesai, `seen` berisi jumlah seluruh baris input.
+    """
+
+    def __init__(self, spec, seed: Optional[int] = None):
+        self.spec = spec
+        self.seed = seed
+        self.seen = 0
+
+    @property
+    def method(self) -> str:
+        return "stride" if isinstance(self.spec, float) else "reservoir"
+
+    def sample(self, rows: Iterable) -> Iterator:
+        if self.method == "stride":
+            f = self.spec
+            for row in rows:
+                if int((self.seen + 1) * f) > int(self.seen * f):
+                    yield row
+                self.seen += 1
+            return
+
+        import random
+
+        rng = random.Random(self.seed)
+        reservoir = []
+        for row in rows:
+            if len(reservoir) < self.spec:
+                reservoir.append(row)
+            else:
+                j = rng.randrange(self.seen + 1)
+                if j < self.spec:
+                    reservoir[j] = row
+            self.seen += 1
+        yield from reservoir
+
+# Fungsi untuk menghitung interval kepercayaan Wilson untuk proporsi k/n
+def wilson_interval(k: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)